@@ -12,9 +12,16 @@ class BaseBackend(abc.ABC):
     and implement all the required methods.
     """
 
+    # names of the backends whose options are already registered
+    _options_registered = set()
+
     def __init__(self):
-        with ibis.config.config_prefix(self.name):
-            self.register_options()
+        # options are process-wide and can only be registered once, while a
+        # backend may be instantiated any number of times
+        if self.name not in BaseBackend._options_registered:
+            with ibis.config.config_prefix(self.name):
+                self.register_options()
+            BaseBackend._options_registered.add(self.name)
 
     @property
     @abc.abstractmethod
@@ -1,6 +1,7 @@
 """Impala backend"""
 import ibis.common.exceptions as com
 import ibis.config
+import ibis.util as util
 from ibis.backends.base import BaseBackend
 from ibis.config import options
 
@@ -11,22 +12,33 @@ from .client import (  # noqa: F401
     ImpalaDatabase,
     ImpalaTable,
 )
-from .compiler import ImpalaDialect, ImpalaQueryBuilder, dialect  # noqa: F401
+from .compiler import (  # noqa: F401
+    ImpalaDialect,
+    ImpalaQueryBuilder,
+    dialect,
+    to_sql,
+)
 from .hdfs import HDFS, WebHDFS, hdfs_connect  # noqa: F401
 from .udf import *  # noqa: F401,F403
 
+_plan_cache = util.ExprCache(lambda: options.impala.plan_cache_size)
+
 
 def compile(expr, params=None):
     """Force compilation of expression.
 
+    The compiled SQL is cached per expression and parameters for as long as
+    the expression is alive, see the ``impala.plan_cache_size`` option.
+
     Returns
     -------
     str
 
     """
-    from .compiler import to_sql
-
-    return to_sql(expr, dialect.make_context(params=params))
+    return _plan_cache.get_or_compute(
+        _plan_cache.key(expr, params),
+        lambda: to_sql(expr, dialect.make_context(params=params)),
+    )
 
 
 def verify(expr, params=None):
@@ -56,6 +68,8 @@ def connect(
 ):
     """Create an ImpalaClient for use with Ibis.
 
+    See :ref:`install.impala` for an example.
+
     Parameters
     ----------
     host : str, optional
@@ -84,25 +98,6 @@ def connect(
     kerberos_service_name : str, optional
         Specify particular impalad service principal.
 
-    Examples
-    --------
-    >>> import ibis
-    >>> import os
-    >>> hdfs_host = os.environ.get('IBIS_TEST_NN_HOST', 'localhost')
-    >>> hdfs_port = int(os.environ.get('IBIS_TEST_NN_PORT', 50070))
-    >>> impala_host = os.environ.get('IBIS_TEST_IMPALA_HOST', 'localhost')
-    >>> impala_port = int(os.environ.get('IBIS_TEST_IMPALA_PORT', 21050))
-    >>> hdfs = ibis.impala.hdfs_connect(host=hdfs_host, port=hdfs_port)
-    >>> hdfs  # doctest: +ELLIPSIS
-    <ibis.filesystems.WebHDFS object at 0x...>
-    >>> client = ibis.impala.connect(
-    ...     host=impala_host,
-    ...     port=impala_port,
-    ...     hdfs_client=hdfs,
-    ... )
-    >>> client  # doctest: +ELLIPSIS
-    <ibis.impala.client.ImpalaClient object at 0x...>
-
     Returns
     -------
     ImpalaClient
@@ -150,3 +145,10 @@ class Backend(BaseBackend):
             '/tmp/ibis',
             'HDFS path for storage of temporary data',
         )
+        ibis.config.register_option(
+            'plan_cache_size',
+            1024,
+            'Maximum number of compiled queries to cache in `compile`. '
+            'Set to 0 to disable the cache.',
+            validator=ibis.config.is_nonnegative_int,
+        )
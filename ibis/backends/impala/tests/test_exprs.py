@@ -1,3 +1,4 @@
+import gc
 import unittest
 from decimal import Decimal
 from io import StringIO
@@ -1790,3 +1791,83 @@ SELECT count(DISTINCT CASE WHEN `value` >= 1.0 THEN `key` ELSE NULL END) AS `nun
 FROM t0"""  # noqa: E501
     result = ibis.impala.compile(expr)
     assert result == expected
+
+
+def test_compile_plan_cache():
+    t = ibis.table([('key', 'string'), ('value', 'double')], name='t0')
+    param = ibis.param('double')
+    impala = ibis.impala
+
+    impala._plan_cache.clear()
+    expr = t[t.value > param]
+    first = impala.compile(expr, params={param: 1.0})
+    # structurally equal expressions share a cache entry
+    second = impala.compile(t[t.value > param], params={param: 1.0})
+    assert second is first
+    assert len(impala._plan_cache) == 1
+
+    other = impala.compile(t[t.value > param], params={param: 2.0})
+    assert other == first.replace('1.0', '2.0')
+    assert len(impala._plan_cache) == 2
+
+    with ibis.config.option_context('impala.plan_cache_size', 0):
+        impala._plan_cache.clear()
+        assert impala.compile(t.key.name('foo')) == impala.compile(
+            t.key.name('foo')
+        )
+        assert not len(impala._plan_cache)
+
+    with pytest.raises(ValueError):
+        ibis.options.impala.plan_cache_size = -1
+
+
+def test_compile_plan_cache_keyed_on_param_types():
+    t = ibis.table([('i', 'int64')], name='t0')
+    param = ibis.param('int64')
+    expr = t[t.i > param]
+
+    ibis.impala.compile(expr, params={param: 1})
+    # True == 1 but is not a valid int64 value: it must not hit the cache
+    with pytest.raises(TypeError):
+        ibis.impala.compile(expr, params={param: True})
+
+
+def test_compile_plan_cache_rebuilt_expressions():
+    # the expression matched by a lookup may be collected during the lookup
+    t = ibis.table([('key', 'string'), ('value', 'double')], name='t0')
+    results = set()
+    for _ in range(500):
+        expr = t.groupby('key').aggregate(
+            s=t.value.sum(), m=t.value.mean()
+        )[lambda x: x.s > 1]
+        results.add(ibis.impala.compile(expr))
+    assert len(results) == 1
+
+
+def test_compile_plan_cache_does_not_keep_expressions_alive():
+    t = ibis.table([('key', 'string'), ('value', 'double')], name='t0')
+    impala = ibis.impala
+    impala._plan_cache.clear()
+
+    expr = t.value.sum()
+    impala.compile(expr)
+    assert len(impala._plan_cache) == 1
+
+    del expr
+    gc.collect()
+    assert not len(impala._plan_cache)
+
+
+def test_compile_plan_cache_hit_skips_context(monkeypatch):
+    t = ibis.table([('key', 'string'), ('value', 'double')], name='t0')
+    impala = ibis.impala
+    impala._plan_cache.clear()
+
+    expr = t.value.sum()
+    expected = impala.compile(expr)
+
+    def make_context(*args, **kwargs):
+        raise AssertionError('context built on a cache hit')
+
+    monkeypatch.setattr(impala.dialect, 'make_context', make_context)
+    assert impala.compile(t.value.sum()) == expected
@@ -6,9 +6,16 @@ import pandas.testing as tm
 import pytest
 
 import ibis
+import ibis.common.exceptions as com
 import ibis.expr.datatypes as dt
 import ibis.expr.types as ir
 
+from ...tests.test_vectorized_udf import (
+    calc_mean,
+    calc_zscore,
+    demean_struct,
+    mean_struct,
+)
 from .. import connect
 from ..udf import nullable, udf
 
@@ -445,3 +452,109 @@ def test_elementwise_udf_with_many_args(t2):
     expected = t2.a.execute()
 
     tm.assert_series_equal(result, expected)
+
+
+@pytest.mark.parametrize('dtype', [dt.float32, dt.float64])
+def test_udf_preserves_floating_precision(dtype):
+    # single precision data must reach the UDFs and come back without being
+    # upcast to double
+    np_dtype = dtype.to_pandas()
+    df = pd.DataFrame(
+        {'key': list('aab'), 'x': np.array([1.0, 2.0, 4.0], dtype=np_dtype)}
+    )
+    t = connect({'df': df}).table('df')
+
+    @udf.elementwise(input_type=[dtype], output_type=dtype)
+    def add_one(s):
+        assert s.dtype == np_dtype
+        return s + 1
+
+    @udf.analytic(input_type=[dtype], output_type=dtype)
+    def demean(s):
+        assert s.dtype == np_dtype
+        return s - s.mean()
+
+    @udf.reduction(input_type=[dtype], output_type=dtype)
+    def mean(s):
+        assert s.dtype == np_dtype
+        return s.mean()
+
+    result = t.mutate(y=add_one(t.x), z=demean(t.x)).execute()
+    assert result.y.dtype == np_dtype
+    assert result.z.dtype == np_dtype
+
+    result = t.groupby('key').aggregate(m=mean(t.x)).execute()
+    assert result.m.dtype == np_dtype
+
+
+def test_elementwise_udf_calls_equal_without_kwargs(t, df):
+    @udf.elementwise(input_type=[dt.double], output_type=dt.double)
+    def add(s, amount=1):
+        return s + amount
+
+    # identical calls produce equal expressions, which a backend is free to
+    # evaluate only once
+    assert add(t.c).equals(add(t.c))
+    assert not add(t.c).equals(add(t.b))
+
+    result = t.mutate(x=add(t.c), y=add(t.c)).execute()
+    tm.assert_series_equal(result.x, df.c + 1, check_names=False)
+    tm.assert_series_equal(result.y, df.c + 1, check_names=False)
+
+    # keyword arguments are bound in a new closure on every call
+    assert not add(t.c, amount=2).equals(add(t.c, amount=2))
+
+
+@pytest.mark.parametrize(
+    ('make_udf', 'func'),
+    [
+        (udf.elementwise, lambda s: s + 1),
+        (udf.analytic, lambda s: s - s.mean()),
+        (udf.reduction, lambda s: s.mean()),
+    ],
+)
+def test_udf_execution_rules_registered_once(t, monkeypatch, make_udf, func):
+    from ..dispatch import execute_node
+
+    expr = make_udf(input_type=[dt.double], output_type=dt.double)(func)(t.c)
+    expr.execute()
+
+    # registering a rule clears the dispatch cache, so executing the same UDF
+    # again must not register anything
+    register = execute_node.register
+    calls = []
+
+    def counting_register(*args, **kwargs):
+        calls.append(args)
+        return register(*args, **kwargs)
+
+    monkeypatch.setattr(execute_node, 'register', counting_register)
+    expr.execute()
+    assert not calls
+
+
+def test_udf_invalid_type_spec():
+    # the spec is parsed once: the error is not raised while handling the
+    # error of a previous parse
+    with pytest.raises(com.IbisTypeError) as excinfo:
+        udf.elementwise(input_type=['!int64x'], output_type=dt.double)(
+            lambda s: s
+        )
+    context = excinfo.value.__context__
+    while context is not None:
+        assert not isinstance(context, com.IbisTypeError)
+        context = context.__context__
+
+
+def test_vectorized_udfs_skip_nulls():
+    # the UDFs serve as references for the backends' results, so they must
+    # follow the null handling of the pandas reductions
+    s = pd.Series([1.0, np.nan, 3.0])
+    tm.assert_series_equal(calc_zscore.func(s), (s - s.mean()) / s.std())
+    assert calc_mean.func(s) == 2.0
+
+    w = pd.Series([2.0, 4.0, np.nan])
+    assert mean_struct.func(s, w) == (2.0, 3.0)
+    demeaned = demean_struct.func(s, w)
+    tm.assert_series_equal(demeaned[0], s - s.mean())
+    tm.assert_series_equal(demeaned[1], w - w.mean())
@@ -157,14 +157,21 @@ class udf:
 def pre_execute_elementwise_udf(op, *clients, scope=None, **kwargs):
     """Register execution rules for elementwise UDFs.
     """
-    input_type = op.input_type
+    _register_elementwise_udf_rules(len(op.input_type))
+    return scope
+
 
-    # definitions
+@functools.lru_cache(maxsize=None)
+def _register_elementwise_udf_rules(nargs):
+    """Register the execution rules for elementwise UDFs of `nargs` arguments.
 
+    Registering a rule clears the dispatch cache of ``execute_node``, so this
+    is only done the first time a given number of arguments is seen instead of
+    on every execution. As a consequence, rules registered afterwards for the
+    same signatures are not overridden.
+    """
     # Define an execution rule for elementwise operations on a
     # grouped Series
-    nargs = len(input_type)
-
     @execute_node.register(
         ops.ElementWiseVectorizedUDF, *(itertools.repeat(SeriesGroupBy, nargs))
     )
@@ -196,29 +203,35 @@ def pre_execute_elementwise_udf(op, *clients, scope=None, **kwargs):
         ops.ElementWiseVectorizedUDF, *(itertools.repeat(object, nargs))
     )
     def execute_udf_node(op, *args, **kwargs):
-        # We have rewritten op.func to be a closure enclosing
-        # the kwargs, and therefore, we do not need to pass
-        # kwargs here. This is true for all udf execution in this
-        # file.
+        # op.func is either the user function itself, when it was called
+        # without kwargs, or a closure enclosing the kwargs, and therefore,
+        # we do not need to pass kwargs here. This is true for all udf
+        # execution in this file.
         # See ibis.udf.vectorized.UserDefinedFunction
         return op.func(*args)
 
-    return scope
-
 
 @pre_execute.register(ops.AnalyticVectorizedUDF)
 @pre_execute.register(ops.AnalyticVectorizedUDF, ibis.client.Client)
 @pre_execute.register(ops.ReductionVectorizedUDF)
 @pre_execute.register(ops.ReductionVectorizedUDF, ibis.client.Client)
 def pre_execute_analytic_and_reduction_udf(op, *clients, scope=None, **kwargs):
-    input_type = op.input_type
-    nargs = len(input_type)
+    _register_analytic_and_reduction_udf_rules(type(op), len(op.input_type))
+    return scope
+
+
+@functools.lru_cache(maxsize=None)
+def _register_analytic_and_reduction_udf_rules(op_type, nargs):
+    """Register the execution rules for analytic and reduction UDFs of type
+    `op_type` taking `nargs` arguments.
 
+    See :func:`_register_elementwise_udf_rules`.
+    """
     # An execution rule to handle analytic and reduction UDFs over
     # 1) an ungrouped window,
     # 2) an ungrouped Aggregate node, or
     # 3) an ungrouped custom aggregation context
-    @execute_node.register(type(op), *(itertools.repeat(pd.Series, nargs)))
+    @execute_node.register(op_type, *(itertools.repeat(pd.Series, nargs)))
     def execute_udaf_node_no_groupby(op, *args, aggcontext, **kwargs):
         return aggcontext.agg(args[0], op.func, *args[1:])
 
@@ -226,7 +239,7 @@ def pre_execute_analytic_and_reduction_udf(op, *clients, scope=None, **kwargs):
     # 1) a grouped window,
     # 2) a grouped Aggregate node, or
     # 3) a grouped custom aggregation context
-    @execute_node.register(type(op), *(itertools.repeat(SeriesGroupBy, nargs)))
+    @execute_node.register(op_type, *(itertools.repeat(SeriesGroupBy, nargs)))
     def execute_udaf_node_groupby(op, *args, aggcontext, **kwargs):
         func = op.func
         if isinstance(aggcontext, Transform):
@@ -279,5 +292,3 @@ def pre_execute_analytic_and_reduction_udf(op, *clients, scope=None, **kwargs):
             # 2) Aggregating over a custom aggregation context
             # No pre-processing to be done for either case.
             return aggcontext.agg(args[0], func, *args[1:])
-
-    return scope
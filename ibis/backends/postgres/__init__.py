@@ -1,9 +1,12 @@
 """PostgreSQL backend."""
+import ibis.config
+import ibis.util as util
 from ibis.backends.base import BaseBackend
 from ibis.backends.base_sqlalchemy.alchemy import (
     AlchemyQueryBuilder,
     to_sqlalchemy,
 )
+from ibis.config import options
 
 from .client import PostgreSQLClient
 from .compiler import (  # noqa: F401, E501
@@ -15,10 +18,16 @@ from .compiler import (  # noqa: F401, E501
 
 __all__ = 'compile', 'connect'
 
+_plan_cache = util.ExprCache(lambda: options.postgres.plan_cache_size)
+
 
 def compile(expr, params=None):
     """Compile an ibis expression to the PostgreSQL target.
 
+    The result is cached per expression and parameters for as long as the
+    expression is alive, see the ``postgres.plan_cache_size`` option. Each
+    call returns its own copy of the cached query.
+
     Parameters
     ----------
     expr : ibis.expr.types.Expr
@@ -53,7 +62,13 @@ def compile(expr, params=None):
     SELECT t0.double_col + %(param_1)s AS tmp
     FROM functional_alltypes AS t0
     """
-    return to_sqlalchemy(expr, dialect.make_context(params=params))
+    query = _plan_cache.get_or_compute(
+        _plan_cache.key(expr, params),
+        lambda: to_sqlalchemy(expr, dialect.make_context(params=params)),
+    )
+    # SQLAlchemy selectables can be modified in place, so callers must not
+    # be handed the cached object itself
+    return query.params()
 
 
 def connect(
@@ -68,6 +83,8 @@ def connect(
     """Create an Ibis client located at `user`:`password`@`host`:`port`
     connected to a PostgreSQL database named `database`.
 
+    See :ref:`install.postgres` for an example.
+
     Parameters
     ----------
     host : string, default 'localhost'
@@ -83,44 +100,6 @@ def connect(
     Returns
     -------
     PostgreSQLClient
-
-    Examples
-    --------
-    >>> import os
-    >>> import getpass
-    >>> host = os.environ.get('IBIS_TEST_POSTGRES_HOST', 'localhost')
-    >>> user = os.environ.get('IBIS_TEST_POSTGRES_USER', getpass.getuser())
-    >>> password = os.environ.get('IBIS_TEST_POSTGRES_PASSWORD')
-    >>> database = os.environ.get('IBIS_TEST_POSTGRES_DATABASE',
-    ...                           'ibis_testing')
-    >>> con = connect(
-    ...     database=database,
-    ...     host=host,
-    ...     user=user,
-    ...     password=password
-    ... )
-    >>> con.list_tables()  # doctest: +ELLIPSIS
-    [...]
-    >>> t = con.table('functional_alltypes')
-    >>> t
-    PostgreSQLTable[table]
-      name: functional_alltypes
-      schema:
-        index : int64
-        Unnamed: 0 : int64
-        id : int32
-        bool_col : boolean
-        tinyint_col : int16
-        smallint_col : int16
-        int_col : int32
-        bigint_col : int64
-        float_col : float32
-        double_col : float64
-        date_string_col : string
-        string_col : string
-        timestamp_col : timestamp
-        year : int32
-        month : int32
     """
     return PostgreSQLClient(
         host=host,
@@ -138,3 +117,12 @@ class Backend(BaseBackend):
     builder = AlchemyQueryBuilder
     dialect = PostgreSQLDialect
     connect = connect
+
+    def register_options(self):
+        ibis.config.register_option(
+            'plan_cache_size',
+            1024,
+            'Maximum number of compiled queries to cache in `compile`. '
+            'Set to 0 to disable the cache.',
+            validator=ibis.config.is_nonnegative_int,
+        )
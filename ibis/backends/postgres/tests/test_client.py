@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gc
 import os
 
 import numpy as np
@@ -95,6 +96,70 @@ def test_compile_toplevel():
     assert str(result) == expected
 
 
+def test_compile_toplevel_cached():
+    t = ibis.table([('foo', 'double')], name='t0')
+    param = ibis.param('double')
+
+    postgres = ibis.postgres
+    postgres._plan_cache.clear()
+
+    expr = t[t.foo > param]
+    first = postgres.compile(expr, params={param: 1.0})
+    # structurally equal expressions share a cache entry
+    second = postgres.compile(t[t.foo > param], params={param: 1.0})
+    assert len(postgres._plan_cache) == 1
+
+    # but every call gets its own copy of the cached query
+    assert second is not first
+    assert str(second) == str(first)
+    first.append_whereclause(sa.text('1 = 1'))
+    assert str(postgres.compile(expr, params={param: 1.0})) == str(second)
+
+    postgres.compile(t[t.foo > param], params={param: 2.0})
+    assert len(postgres._plan_cache) == 2
+
+    with pytest.raises(ValueError):
+        ibis.options.postgres.plan_cache_size = -1
+
+
+def test_compile_toplevel_cache_hit_skips_context(monkeypatch):
+    t = ibis.table([('foo', 'double')], name='t0')
+    expr = t.foo.sum()
+    expected = ibis.postgres.compile(expr)
+
+    def make_context(*args, **kwargs):
+        raise AssertionError('context built on a cache hit')
+
+    monkeypatch.setattr(ibis.postgres.dialect, 'make_context', make_context)
+    assert str(ibis.postgres.compile(t.foo.sum())) == str(expected)
+
+
+def test_compile_toplevel_cache_rebuilt_expressions():
+    # the expression matched by a lookup may be collected during the lookup
+    t = ibis.table([('key', 'string'), ('value', 'double')], name='t0')
+    results = set()
+    for _ in range(500):
+        expr = t.groupby('key').aggregate(
+            s=t.value.sum(), m=t.value.mean()
+        )[lambda x: x.s > 1]
+        results.add(str(ibis.postgres.compile(expr)))
+    assert len(results) == 1
+
+
+def test_compile_toplevel_cache_does_not_keep_expressions_alive():
+    t = ibis.table([('foo', 'double')], name='t0')
+    postgres = ibis.postgres
+    postgres._plan_cache.clear()
+
+    expr = t.foo.sum()
+    postgres.compile(expr)
+    assert len(postgres._plan_cache) == 1
+
+    del expr
+    gc.collect()
+    assert not len(postgres._plan_cache)
+
+
 def test_list_databases(con):
     assert POSTGRES_TEST_DB is not None
     assert POSTGRES_TEST_DB in con.list_databases()
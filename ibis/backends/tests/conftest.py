@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 from typing import List
 
+import pandas as pd
 import pytest
 
 import ibis
@@ -203,7 +204,17 @@ def analytic_alltypes(alltypes):
 
 @pytest.fixture(scope='session')
 def df(alltypes):
-    return alltypes.execute()
+    """Executed ``functional_alltypes``, shared by every test of a session.
+
+    Tests must treat this frame as read-only and derive new frames with e.g.
+    ``df.assign``; an in-place modification would leak into later tests.
+    """
+    df = alltypes.execute()
+    snapshot = df.copy()
+    yield df
+    pd.testing.assert_frame_equal(
+        df, snapshot, obj='df fixture (modified in place by a test)'
+    )
 
 
 @pytest.fixture(scope='session')
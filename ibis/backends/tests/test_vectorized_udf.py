@@ -1,6 +1,8 @@
+import os
 import tempfile
-from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 
 import ibis
@@ -9,17 +11,66 @@ import ibis.expr.datatypes as dt
 from ibis.expr.window import window
 from ibis.udf.vectorized import analytic, elementwise, reduction
 
-pytestmark = pytest.mark.udf
+# TODO - udf - #2553: add dask once it supports destructuring UDFs
+UDF_BACKENDS = ['pandas', 'pyspark']
+
+pytestmark = [pytest.mark.udf, pytest.mark.only_on_backends(UDF_BACKENDS)]
+
+
+def _shift(v, *offsets):
+    """Return `v` shifted by each of `offsets`.
+
+    All the outputs are computed by a single ufunc call over the NumPy buffer
+    of `v`, writing into one ``(len(offsets), len(v))`` block.
+    """
+    shifted = np.add.outer(offsets, v.to_numpy())
+    return tuple(pd.Series(col, index=v.index) for col in shifted)
+
+
+def _demean(*columns):
+    """Subtract its mean from each of `columns`.
+
+    Means skip nulls, like the pandas reductions. The outputs are written
+    into rows of a single ``(len(columns), n)`` block, of the dtype the
+    subtractions promote to, rather than allocated one by one.
+    """
+    arrays = [np.asarray(col) for col in columns]
+    means = [np.nanmean(a) for a in arrays]
+    out = np.empty(
+        (len(arrays), len(arrays[0])), dtype=np.result_type(*arrays, *means)
+    )
+    for row, a, mean in zip(out, arrays, means):
+        np.subtract(a, mean, out=row)
+    return tuple(
+        pd.Series(row, index=col.index) for row, col in zip(out, columns)
+    )
+
+
+def _mean(*columns):
+    """Return the mean of each of `columns`.
+
+    Columns are reduced as NumPy arrays, avoiding the overhead of a pandas
+    reduction per column and per group, and skipping nulls like the pandas
+    reduction would. Windowed aggregations pass raw arrays, hence
+    ``np.asarray``.
+    """
+    return tuple(np.nanmean(np.asarray(col)) for col in columns)
 
 
 @elementwise(input_type=[dt.double], output_type=dt.double)
 def add_one(s):
-    return s + 1
+    # Operate on the underlying NumPy buffer to skip pandas' operator
+    # dispatch
+    return pd.Series(s.to_numpy() + 1, index=s.index, name=s.name)
 
 
 @analytic(input_type=[dt.double], output_type=dt.double)
 def calc_zscore(s):
-    return (s - s.mean()) / s.std()
+    # The pandas reductions skip nulls; the arithmetic runs on the NumPy
+    # buffer and scales the deviations in place
+    dev = s.to_numpy() - s.mean()
+    dev /= s.std()
+    return pd.Series(dev, index=s.index, name=s.name)
 
 
 @reduction(input_type=[dt.double], output_type=dt.double)
@@ -32,7 +83,7 @@ def calc_mean(s):
     output_type=dt.Struct(['col1', 'col2'], [dt.double, dt.double]),
 )
 def add_one_struct(v):
-    return v + 1, v + 2
+    return _shift(v, 1, 2)
 
 
 @elementwise(
@@ -40,7 +91,7 @@ def add_one_struct(v):
     output_type=dt.Struct(['double_col', 'col2'], [dt.double, dt.double]),
 )
 def overwrite_struct_elementwise(v):
-    return v + 1, v + 2
+    return _shift(v, 1, 2)
 
 
 @elementwise(
@@ -50,7 +101,7 @@ def overwrite_struct_elementwise(v):
     ),
 )
 def multiple_overwrite_struct_elementwise(v):
-    return v + 1, v + 2, v + 3
+    return _shift(v, 1, 2, 3)
 
 
 @analytic(
@@ -60,7 +111,7 @@ def multiple_overwrite_struct_elementwise(v):
     ),
 )
 def overwrite_struct_analytic(v, w):
-    return v - v.mean(), w - w.mean()
+    return _demean(v, w)
 
 
 @analytic(
@@ -68,7 +119,7 @@ def overwrite_struct_analytic(v, w):
     output_type=dt.Struct(['demean', 'demean_weight'], [dt.double, dt.double]),
 )
 def demean_struct(v, w):
-    return v - v.mean(), w - w.mean()
+    return _demean(v, w)
 
 
 @reduction(
@@ -76,7 +127,7 @@ def demean_struct(v, w):
     output_type=dt.Struct(['mean', 'mean_weight'], [dt.double, dt.double]),
 )
 def mean_struct(v, w):
-    return v.mean(), w.mean()
+    return _mean(v, w)
 
 
 @reduction(
@@ -86,10 +137,9 @@ def mean_struct(v, w):
     ),
 )
 def overwrite_struct_reduction(v, w):
-    return v.mean(), w.mean()
+    return _mean(v, w)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_elementwise_udf(backend, alltypes, df):
     result = add_one(alltypes['double_col']).execute()
@@ -97,7 +147,6 @@ def test_elementwise_udf(backend, alltypes, df):
     backend.assert_series_equal(result, expected, check_names=False)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_elementwise_udf_mutate(backend, alltypes, df):
     expr = alltypes.mutate(incremented=add_one(alltypes['double_col']))
@@ -108,7 +157,6 @@ def test_elementwise_udf_mutate(backend, alltypes, df):
     backend.assert_series_equal(result['incremented'], expected['incremented'])
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_analytic_udf(backend, alltypes, df):
     result = calc_zscore(alltypes['double_col']).execute()
@@ -116,7 +164,6 @@ def test_analytic_udf(backend, alltypes, df):
     backend.assert_series_equal(result, expected, check_names=False)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_analytic_udf_mutate(backend, alltypes, df):
     expr = alltypes.mutate(zscore=calc_zscore(alltypes['double_col']))
@@ -127,7 +174,6 @@ def test_analytic_udf_mutate(backend, alltypes, df):
     backend.assert_series_equal(result['zscore'], expected['zscore'])
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_reduction_udf(backend, alltypes, df):
     result = calc_mean(alltypes['double_col']).execute()
@@ -135,7 +181,6 @@ def test_reduction_udf(backend, alltypes, df):
     assert result == expected
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_output_type_in_list_invalid(backend, alltypes, df):
     # Test that an error is raised if UDF output type is wrapped in a list
@@ -150,7 +195,6 @@ def test_output_type_in_list_invalid(backend, alltypes, df):
             return s + 1
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_valid_kwargs(backend, alltypes, df):
     # Test different forms of UDF definition with keyword arguments
@@ -191,7 +235,6 @@ def test_valid_kwargs(backend, alltypes, df):
     backend.assert_frame_equal(result, expected)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_valid_args(backend, alltypes, df):
     # Test different forms of UDF definition with *args
@@ -217,7 +260,6 @@ def test_valid_args(backend, alltypes, df):
     backend.assert_frame_equal(result, expected)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_valid_args_and_kwargs(backend, alltypes, df):
     # Test UDFs with both *args and keyword arguments
@@ -260,7 +302,6 @@ def test_valid_args_and_kwargs(backend, alltypes, df):
     backend.assert_frame_equal(result, expected)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_invalid_kwargs(backend, alltypes):
     # Test that defining a UDF with a non-column argument that is not a
@@ -273,34 +314,26 @@ def test_invalid_kwargs(backend, alltypes):
             return v + 1
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
 @pytest.mark.xfail_unsupported
-def test_elementwise_udf_destruct(backend, alltypes):
+def test_elementwise_udf_destruct(backend, alltypes, df):
     result = alltypes.mutate(
         add_one_struct(alltypes['double_col']).destructure()
     ).execute()
 
-    expected = alltypes.mutate(
-        col1=alltypes['double_col'] + 1, col2=alltypes['double_col'] + 2,
-    ).execute()
+    expected = df.assign(col1=df['double_col'] + 1, col2=df['double_col'] + 2)
 
     backend.assert_frame_equal(result, expected)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
 @pytest.mark.xfail_unsupported
-def test_elementwise_udf_overwrite_destruct(backend, alltypes):
+def test_elementwise_udf_overwrite_destruct(backend, alltypes, df):
     result = alltypes.mutate(
         overwrite_struct_elementwise(alltypes['double_col']).destructure()
     ).execute()
 
-    expected = alltypes.mutate(
-        double_col=alltypes['double_col'] + 1, col2=alltypes['double_col'] + 2,
-    ).execute()
+    expected = df.assign(
+        double_col=df['double_col'] + 1, col2=df['double_col'] + 2
+    )
 
     # TODO issue #2649
     # Due to a known limitation with how we treat DestructColumn
@@ -311,11 +344,8 @@ def test_elementwise_udf_overwrite_destruct(backend, alltypes):
     backend.assert_frame_equal(result, expected, check_like=True)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
 @pytest.mark.xfail_unsupported
-def test_elementwise_udf_overwrite_destruct_and_assign(backend, alltypes):
+def test_elementwise_udf_overwrite_destruct_and_assign(backend, alltypes, df):
     result = (
         alltypes.mutate(
             overwrite_struct_elementwise(alltypes['double_col']).destructure()
@@ -324,11 +354,11 @@ def test_elementwise_udf_overwrite_destruct_and_assign(backend, alltypes):
         .execute()
     )
 
-    expected = alltypes.mutate(
-        double_col=alltypes['double_col'] + 1,
-        col2=alltypes['double_col'] + 2,
-        col3=alltypes['int_col'] * 3,
-    ).execute()
+    expected = df.assign(
+        double_col=df['double_col'] + 1,
+        col2=df['double_col'] + 2,
+        col3=df['int_col'] * 3,
+    )
 
     # TODO issue #2649
     # Due to a known limitation with how we treat DestructColumn
@@ -339,9 +369,6 @@ def test_elementwise_udf_overwrite_destruct_and_assign(backend, alltypes):
     backend.assert_frame_equal(result, expected, check_like=True)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
 @pytest.mark.xfail_unsupported
 @pytest.mark.min_spark_version('3.1')
 def test_elementwise_udf_destruct_exact_once(backend, alltypes):
@@ -353,9 +380,14 @@ def test_elementwise_udf_destruct_exact_once(backend, alltypes):
         )
         def add_one_struct_exact_once(v):
             key = v.iloc[0]
-            path = Path(f"{tempdir}/{key}")
-            assert not path.exists()
-            path.touch()
+            # create the marker file atomically, failing if it already exists
+            try:
+                fd = os.open(
+                    f"{tempdir}/{key}", os.O_CREAT | os.O_EXCL | os.O_WRONLY
+                )
+            except FileExistsError:
+                raise AssertionError(f"UDF executed more than once on {key}")
+            os.close(fd)
             return v + 1, v + 2
 
         result = alltypes.mutate(
@@ -367,22 +399,19 @@ def test_elementwise_udf_destruct_exact_once(backend, alltypes):
         assert len(result) > 0
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
 @pytest.mark.xfail_unsupported
-def test_elementwise_udf_multiple_overwrite_destruct(backend, alltypes):
+def test_elementwise_udf_multiple_overwrite_destruct(backend, alltypes, df):
     result = alltypes.mutate(
         multiple_overwrite_struct_elementwise(
             alltypes['double_col']
         ).destructure()
     ).execute()
 
-    expected = alltypes.mutate(
-        double_col=alltypes['double_col'] + 1,
-        col2=alltypes['double_col'] + 2,
-        float_col=alltypes['double_col'] + 3,
-    ).execute()
+    expected = df.assign(
+        double_col=df['double_col'] + 1,
+        col2=df['double_col'] + 2,
+        float_col=df['double_col'] + 3,
+    )
 
     # TODO issue #2649
     # Due to a known limitation with how we treat DestructColumn
@@ -393,7 +422,6 @@ def test_elementwise_udf_multiple_overwrite_destruct(backend, alltypes):
     backend.assert_frame_equal(result, expected, check_like=True)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
 @pytest.mark.xfail_unsupported
 def test_elementwise_udf_named_destruct(backend, alltypes):
     """Test error when assigning name to a destruct column."""
@@ -408,7 +436,7 @@ def test_elementwise_udf_named_destruct(backend, alltypes):
 
 @pytest.mark.only_on_backends(['pyspark'])
 @pytest.mark.xfail_unsupported
-def test_elementwise_udf_struct(backend, alltypes):
+def test_elementwise_udf_struct(backend, alltypes, df):
     result = alltypes.mutate(
         new_col=add_one_struct(alltypes['double_col'])
     ).execute()
@@ -417,17 +445,13 @@ def test_elementwise_udf_struct(backend, alltypes):
         col2=result['new_col'].apply(lambda x: x[1]),
     )
     result = result.drop('new_col', axis=1)
-    expected = alltypes.mutate(
-        col1=alltypes['double_col'] + 1, col2=alltypes['double_col'] + 2,
-    ).execute()
+    expected = df.assign(col1=df['double_col'] + 1, col2=df['double_col'] + 2)
 
     backend.assert_frame_equal(result, expected)
 
 
 @pytest.mark.only_on_backends(['pandas'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
-def test_analytic_udf_destruct(backend, alltypes):
+def test_analytic_udf_destruct(backend, alltypes, df):
     w = window(preceding=None, following=None, group_by='year')
 
     result = alltypes.mutate(
@@ -436,19 +460,17 @@ def test_analytic_udf_destruct(backend, alltypes):
         .destructure()
     ).execute()
 
-    expected = alltypes.mutate(
-        demean=alltypes['double_col'] - alltypes['double_col'].mean().over(w),
-        demean_weight=alltypes['int_col'] - alltypes['int_col'].mean().over(w),
-    ).execute()
+    grouped = df.groupby('year')
+    expected = df.assign(
+        demean=df['double_col'] - grouped['double_col'].transform('mean'),
+        demean_weight=df['int_col'] - grouped['int_col'].transform('mean'),
+    )
 
     backend.assert_frame_equal(result, expected)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
 @pytest.mark.xfail_unsupported
-def test_analytic_udf_destruct_overwrite(backend, alltypes):
+def test_analytic_udf_destruct_overwrite(backend, alltypes, df):
     w = window(preceding=None, following=None, group_by='year')
 
     result = alltypes.mutate(
@@ -457,11 +479,11 @@ def test_analytic_udf_destruct_overwrite(backend, alltypes):
         .destructure()
     ).execute()
 
-    expected = alltypes.mutate(
-        double_col=alltypes['double_col']
-        - alltypes['double_col'].mean().over(w),
-        demean_weight=alltypes['int_col'] - alltypes['int_col'].mean().over(w),
-    ).execute()
+    grouped = df.groupby('year')
+    expected = df.assign(
+        double_col=df['double_col'] - grouped['double_col'].transform('mean'),
+        demean_weight=df['int_col'] - grouped['int_col'].transform('mean'),
+    )
 
     # TODO issue #2649
     # Due to a known limitation with how we treat DestructColumn
@@ -473,9 +495,7 @@ def test_analytic_udf_destruct_overwrite(backend, alltypes):
 
 
 @pytest.mark.only_on_backends(['pandas'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
-def test_reduction_udf_destruct_groupby(backend, alltypes):
+def test_reduction_udf_destruct_groupby(backend, alltypes, df):
     result = (
         alltypes.groupby('year')
         .aggregate(
@@ -486,49 +506,43 @@ def test_reduction_udf_destruct_groupby(backend, alltypes):
         .execute()
     )
 
-    expected = (
-        alltypes.groupby('year')
-        .aggregate(
-            mean=alltypes['double_col'].mean(),
-            mean_weight=alltypes['int_col'].mean(),
-        )
-        .execute()
+    expected = df.groupby('year', as_index=False).agg(
+        mean=('double_col', 'mean'), mean_weight=('int_col', 'mean')
     )
 
     backend.assert_frame_equal(result, expected)
 
 
 @pytest.mark.only_on_backends(['pandas'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
-def test_reduction_udf_destruct_no_groupby(backend, alltypes):
+def test_reduction_udf_destruct_no_groupby(backend, alltypes, df):
     result = alltypes.aggregate(
         mean_struct(alltypes['double_col'], alltypes['int_col']).destructure()
     ).execute()
 
-    expected = alltypes.aggregate(
-        mean=alltypes['double_col'].mean(),
-        mean_weight=alltypes['int_col'].mean(),
-    ).execute()
+    expected = pd.DataFrame(
+        {
+            'mean': [df['double_col'].mean()],
+            'mean_weight': [df['int_col'].mean()],
+        }
+    )
 
     backend.assert_frame_equal(result, expected)
 
 
-@pytest.mark.only_on_backends(['pandas', 'pyspark'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
 @pytest.mark.xfail_unsupported
-def test_reduction_udf_destruct_no_groupby_overwrite(backend, alltypes):
+def test_reduction_udf_destruct_no_groupby_overwrite(backend, alltypes, df):
     result = alltypes.aggregate(
         overwrite_struct_reduction(
             alltypes['double_col'], alltypes['int_col']
         ).destructure()
     ).execute()
 
-    expected = alltypes.aggregate(
-        double_col=alltypes['double_col'].mean(),
-        mean_weight=alltypes['int_col'].mean(),
-    ).execute()
+    expected = pd.DataFrame(
+        {
+            'double_col': [df['double_col'].mean()],
+            'mean_weight': [df['int_col'].mean()],
+        }
+    )
     # TODO issue #2649
     # Due to a known limitation with how we treat DestructColumn
     # in assignments, the ordering of op.selections may not exactly
@@ -539,8 +553,6 @@ def test_reduction_udf_destruct_no_groupby_overwrite(backend, alltypes):
 
 
 @pytest.mark.only_on_backends(['pandas'])
-# TODO - udf - #2553
-@pytest.mark.xfail_backends(['dask'])
 def test_reduction_udf_destruct_window(backend, alltypes):
     win = window(
         preceding=ibis.interval(hours=2),
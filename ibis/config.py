@@ -894,3 +894,10 @@ is_bool = is_type_factory(bool)
 is_float = is_type_factory(float)
 is_str = is_type_factory(str)
 is_text = is_instance_factory((str, bytes))
+
+
+def is_nonnegative_int(x):
+    """Check that the given value is an integer greater than or equal to 0."""
+    is_int(x)
+    if x < 0:
+        raise ValueError("Value must be a non-negative integer")
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import Optional
 
 import ibis.expr.operations as ops
@@ -20,8 +21,6 @@ class FormatMemo:
     """
 
     def __init__(self, get_text_repr: bool = False):
-        from collections import defaultdict
-
         self.formatted = {}
         self.aliases = {}
         self.ops = {}
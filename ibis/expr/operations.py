@@ -31,7 +31,7 @@ def distinct_roots(*expressions):
 
 
 class Node(Annotable):
-    __slots__ = '_expr_cached', '_hash'
+    __slots__ = '_expr_cached', '_hash', '__weakref__'
 
     def __repr__(self):
         return self._repr()
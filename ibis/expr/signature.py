@@ -146,9 +146,12 @@ class AnnotableMeta(type):
         slots, signature = [], TypeSignature()
 
         for parent in bases:
-            # inherit parent slots
+            # inherit parent slots, except __weakref__ which cannot be
+            # redeclared once a parent provides it
             if hasattr(parent, '__slots__'):
-                slots += parent.__slots__
+                slots += [
+                    slot for slot in parent.__slots__ if slot != '__weakref__'
+                ]
             # inherit from parent signatures
             if hasattr(parent, 'signature'):
                 signature.update(parent.signature)
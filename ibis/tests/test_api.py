@@ -103,3 +103,13 @@ def test_top_level_api():
     ]
 
     assert sorted(ibis.__all__) == sorted(known_api)
+
+
+def test_backend_instantiated_twice():
+    from ibis.backends.pandas import Backend
+
+    # options were registered when ibis was imported; instantiating the
+    # backend again must not try to register them twice
+    Backend()
+    Backend()
+    assert not ibis.options.pandas.enable_trace
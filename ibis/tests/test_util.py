@@ -0,0 +1,79 @@
+import gc
+
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+import ibis
+from ibis.util import ExprCache, LRUCache, coerce_to_dataframe
+
+
+@pytest.mark.parametrize('maxsize', [0, -1])
+def test_lru_cache_disabled(maxsize):
+    cache = LRUCache(lambda: maxsize)
+    assert cache.get_or_compute('key', lambda: 1) == 1
+    assert cache.get_or_compute('key', lambda: 2) == 2
+    assert not len(cache)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(lambda: 2)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    # a hit makes 'a' the most recently used entry
+    assert cache.get_or_compute('a', lambda: 3) == 1
+    cache.get_or_compute('c', lambda: 4)
+    assert len(cache) == 2
+    assert cache.get_or_compute('b', lambda: 5) == 5
+
+
+def test_expr_cache_drops_entries_of_collected_expressions():
+    t = ibis.table([('a', 'double')], name='t')
+    param = ibis.param('double')
+    cache = ExprCache(lambda: 10)
+
+    expr = t.a + param
+    for value in (1.0, 2.0):
+        key = cache.key(expr, {param: value})
+        cache.get_or_compute(key, lambda: value)
+    other = t.a * 2
+    cache.get_or_compute(cache.key(other), lambda: 'other')
+    assert len(cache) == 3
+
+    # equal expressions share the entries
+    assert cache.get_or_compute(cache.key(t.a + param, {param: 1.0}), None)
+
+    del expr, key
+    gc.collect()
+    assert len(cache) == 1
+    assert cache.get_or_compute(cache.key(t.a * 2), None) == 'other'
+
+
+def test_coerce_to_dataframe_series_of_tuples():
+    data = pd.Series([(1, 'a', 1.5), (2, 'b', 2.5)], index=[10, 20])
+    result = coerce_to_dataframe(data, ['x', 'y', 'z'])
+    expected = pd.DataFrame(
+        {'x': [1, 2], 'y': ['a', 'b'], 'z': [1.5, 2.5]}, index=[10, 20]
+    )
+    tm.assert_frame_equal(result, expected)
+
+
+def test_coerce_to_dataframe_empty_series():
+    data = pd.Series([], dtype=object)
+    result = coerce_to_dataframe(data, ['x', 'y'])
+    assert list(result.columns) == ['x', 'y']
+    assert result.empty
+
+
+def test_coerce_to_dataframe_tuple_of_series():
+    index = [10, 20]
+    data = pd.Series([1, 2], index=index), pd.Series([1.5, 2.5], index=index)
+    result = coerce_to_dataframe(data, ['x', 'y'])
+    expected = pd.DataFrame({'x': [1, 2], 'y': [1.5, 2.5]}, index=index)
+    tm.assert_frame_equal(result, expected)
+
+
+def test_coerce_to_dataframe_tuple_of_scalars():
+    result = coerce_to_dataframe((1, 2.5), ['x', 'y'])
+    expected = pd.DataFrame({'x': [1], 'y': [2.5]})
+    tm.assert_frame_equal(result, expected)
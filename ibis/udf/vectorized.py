@@ -16,10 +16,34 @@ from ibis.expr.operations import (
 )
 
 
+@functools.lru_cache(maxsize=None)
+def _interned_dtype(kind, value):
+    # `kind` is the type of `value`: keying on it ensures that strings and
+    # datatypes are never compared with each other, which raises
+    return dt.dtype(value)
+
+
+def _dtype(value):
+    """Convert `value` to an ibis datatype, reusing the result of previous
+    conversions of equal values.
+    """
+    try:
+        hash(value)
+    except TypeError:
+        # unhashable, convert without caching
+        return dt.dtype(value)
+    return _interned_dtype(type(value), value)
+
+
 class UserDefinedFunction(object):
     """ Class representing a user defined function.
 
     This class Implements __call__ that returns an ibis expr for the UDF.
+
+    Calls without keyword arguments on the same arguments produce equal
+    expressions, which backends may evaluate only once: the function is
+    expected to be deterministic and free of side effects. Calls with keyword
+    arguments always produce distinct expressions.
     """
 
     def __init__(self, func, func_type, input_type, output_type):
@@ -28,17 +52,24 @@ class UserDefinedFunction(object):
 
         self.func = func
         self.func_type = func_type
-        self.input_type = list(map(dt.dtype, input_type))
-        self.output_type = dt.dtype(output_type)
+        self.input_type = list(map(_dtype, input_type))
+        self.output_type = _dtype(output_type)
 
     def __call__(self, *args, **kwargs):
-        # kwargs cannot be part of the node object because it can contain
-        # unhashable object, e.g., list.
-        # Here, we keep the node hashable by creating a closure that contains
-        # kwargs.
-        @functools.wraps(self.func)
-        def func(*args):
-            return self.func(*args, **kwargs)
+        if kwargs:
+            # kwargs cannot be part of the node object because it can contain
+            # unhashable object, e.g., list.
+            # Here, we keep the node hashable by creating a closure that
+            # contains kwargs.
+            @functools.wraps(self.func)
+            def func(*args):
+                return self.func(*args, **kwargs)
+
+        else:
+            # Without kwargs there is nothing to bind: call the function
+            # directly, which also makes repeated calls on the same arguments
+            # produce equal nodes
+            func = self.func
 
         op = self.func_type(
             func=func,
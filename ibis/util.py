@@ -5,10 +5,14 @@ import itertools
 import logging
 import operator
 import os
+import threading
 import types
+import weakref
 from numbers import Real
 from typing import (
     Any,
+    Callable,
+    Hashable,
     Iterator,
     List,
     Optional,
@@ -85,7 +89,9 @@ def coerce_to_dataframe(data: Any, names: List[str]) -> pd.DataFrame:
 
     Note:
     This method does NOT always return a new DataFrame. If a DataFrame is
-    passed in, this method will return the original object.
+    passed in, this method will return the original object. If a list/tuple
+    of Series is passed in, the columns of the result are not copied and
+    share memory with the given Series.
 
     Parameters
     ----------
@@ -98,12 +104,11 @@ def coerce_to_dataframe(data: Any, names: List[str]) -> pd.DataFrame:
     if isinstance(data, pd.DataFrame):
         result = data
     elif isinstance(data, pd.Series):
-        num_cols = len(data.iloc[0])
-        series = [data.apply(lambda t: t[i]) for i in range(num_cols)]
-        result = pd.concat(series, axis=1)
+        # Unpack all the elements in a single pass
+        result = pd.DataFrame(data.tolist(), index=data.index, columns=names)
     elif isinstance(data, (tuple, list)):
         if isinstance(data[0], pd.Series):
-            result = pd.concat(data, axis=1)
+            result = pd.concat(data, axis=1, copy=False)
         else:
             # Promote scalar to Series
             result = pd.concat([pd.Series([v]) for v in data], axis=1)
@@ -384,3 +389,142 @@ def consume(iterator: Iterator[T], n: Optional[int] = None) -> None:
     else:
         # advance to the empty slice starting at position n
         next(itertools.islice(iterator, n, n), None)
+
+
+class LRUCache:
+    """A thread-safe mapping that evicts its least recently used entries.
+
+    Parameters
+    ----------
+    maxsize : callable
+        Zero-argument callable returning the maximum number of entries. It is
+        consulted on every insertion so that the size can be backed by an
+        option; a size of zero or less disables caching.
+    """
+
+    def __init__(self, maxsize: Callable[[], int]) -> None:
+        self._maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_or_compute(self, key: Optional[Hashable], compute: Callable):
+        """Return the value cached under `key`, computing it on a miss.
+
+        Parameters
+        ----------
+        key : Hashable or None
+            Cache key. If ``None`` the value is computed and not cached.
+        compute : callable
+            Zero-argument callable producing the value
+
+        Returns
+        -------
+        object
+        """
+        maxsize = self._maxsize()
+        if key is None or maxsize <= 0:
+            return compute()
+
+        with self._lock:
+            try:
+                value = self._data[key]
+                # The stored key may stop comparing equal to `key` between
+                # the two lookups, e.g. an ExprCache key whose operation was
+                # collected meanwhile: handle that as a miss
+                self._data.move_to_end(key)
+            except KeyError:
+                pass
+            else:
+                return value
+
+        value = compute()
+
+        with self._lock:
+            self._data[key] = value
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Remove all the entries of the cache."""
+        with self._lock:
+            self._data.clear()
+
+
+class ExprCache(LRUCache):
+    """An :class:`LRUCache` of values computed from expressions.
+
+    Entries are keyed on the structure of an expression and its parameters,
+    so equal expressions built independently share an entry. The cache only
+    holds a weak reference to the expression's operation: an entry is dropped
+    once its operation is garbage collected, so the cache never keeps
+    expressions alive. The size limit still bounds the number of entries.
+
+    Parameters
+    ----------
+    maxsize : callable
+        Zero-argument callable returning the maximum number of entries
+    """
+
+    def __init__(self, maxsize: Callable[[], int]) -> None:
+        super().__init__(maxsize)
+        self._pending_removals = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge()
+            return len(self._data)
+
+    def key(self, expr, params=None) -> Optional[Hashable]:
+        """Build the key identifying the computation on `expr` with `params`.
+
+        Parameters
+        ----------
+        expr : ibis.expr.types.Expr
+        params : dict, optional
+            Mapping of :class:`ibis.expr.types.ScalarParameter` to values
+
+        Returns
+        -------
+        Hashable or None
+            ``None`` if the expression or the parameter values are not
+            hashable
+        """
+        expr_type, name, op = expr._key
+        try:
+            # values of different types may compare equal, e.g. 1 and True,
+            # yet be validated differently by the compiler
+            params_key = frozenset(
+                (param.op(), type(value), value)
+                for param, value in (params or {}).items()
+            )
+            # the reference carries the rest of the key, so that the entry can
+            # be found without a scan once the operation is collected
+            ref = weakref.KeyedRef(
+                op, self._remove, (expr_type, name, params_key)
+            )
+            key = (ref,) + ref.key
+            # a weak reference can only be hashed while its referent is alive
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get_or_compute(self, key: Optional[Hashable], compute: Callable):
+        with self._lock:
+            self._purge()
+        return super().get_or_compute(key, compute)
+
+    def _remove(self, ref: weakref.ref) -> None:
+        # Called by the garbage collector, possibly while the lock is held by
+        # the current thread, so the removal is deferred to the next access
+        self._pending_removals.append(ref)
+
+    def _purge(self) -> None:
+        while self._pending_removals:
+            ref = self._pending_removals.pop()
+            # a dead reference only compares equal to itself
+            self._data.pop((ref,) + ref.key, None)